@@ -173,6 +173,11 @@ class Settings(BaseSettings):
         alias="QUIZ_TARGET_PER_ATTEMPT",
         description="1回の生成で狙う問題数（短い出力で確実に返す）"
     )
+    quiz_max_concurrency: int = Field(
+        default=3,
+        alias="QUIZ_MAX_CONCURRENCY",
+        description="1回の試行でcitationごとのLLM生成を並列実行する際の最大同時実行数（Ollamaの過負荷防止）"
+    )
     
     # Quiz専用サンプリング設定（教材からの出題に特化）
     quiz_pool_max_ids_per_source: int = Field(
@@ -200,6 +205,11 @@ class Settings(BaseSettings):
         alias="QUIZ_CITATIONS_MIN",
         description="最低引用数（これ以下なら再取得）"
     )
+    quiz_near_duplicate_threshold: float = Field(
+        default=0.0,
+        alias="QUIZ_NEAR_DUPLICATE_THRESHOLD",
+        description="statement近似重複判定に使う文字3-gramのJaccard類似度の閾値（0で無効）"
+    )
 
     # Ollama設定（環境変数名を明示的に指定して事故防止）
     ollama_base_url: str = Field(
@@ -244,6 +254,11 @@ class Settings(BaseSettings):
         alias="QUIZ_FORCE_JSON",
         description="Quiz生成時に format=json を強制（JSON安定性向上、○のみ生成で推奨）"
     )
+    quiz_json_schema: bool = Field(
+        default=True,
+        alias="QUIZ_JSON_SCHEMA",
+        description="Quiz生成時に format へJSON Schemaを渡して出力構造をデコード時に強制（Ollama 0.5以降、quiz_force_json有効時のみ）"
+    )
 
     # 将来のGEMINI APIキー（未使用）
     # gemini_api_key: str = ""
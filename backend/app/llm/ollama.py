@@ -9,10 +9,14 @@ import httpx
 
 from app.core.settings import settings
 from app.llm.base import LLMClient, LLMTimeoutError, LLMInternalError
+from app.schemas.quiz import LLMQuizOutput
 
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# Quiz生成の構造化出力用JSON Schema（起動時に1回だけ生成）
+QUIZ_OUTPUT_SCHEMA: Dict[str, Any] = LLMQuizOutput.model_json_schema()
+
 
 def extract_ollama_text(raw: Any) -> Tuple[str, dict]:
     """
@@ -151,9 +155,10 @@ class OllamaClient:
             if settings.quiz_ollama_model:
                 payload["model"] = settings.quiz_ollama_model
             
-            # format: json を強制（JSON安定性向上）
+            # format: JSON Schema（または json）を強制（JSON安定性向上）
+            # JSON Schemaを渡すと、スキーマ外の出力がデコード時点で生成できなくなる
             if settings.quiz_force_json:
-                payload["format"] = "json"
+                payload["format"] = QUIZ_OUTPUT_SCHEMA if settings.quiz_json_schema else "json"
             
             # options: 生成上限、コンテキスト上限、temperature
             payload["options"] = {
@@ -167,7 +172,8 @@ class OllamaClient:
                 f"num_predict={settings.quiz_ollama_num_predict}, "
                 f"num_ctx={settings.quiz_ollama_num_ctx}, "
                 f"temperature={settings.quiz_ollama_temperature}, "
-                f"force_json={settings.quiz_force_json}"
+                f"force_json={settings.quiz_force_json}, "
+                f"json_schema={settings.quiz_json_schema}"
             )
         
         try:
@@ -3,108 +3,34 @@
 """
 from typing import List, Literal
 
+from app.core.settings import settings
 from app.schemas.common import Citation
 
+# JSON出力形式のルール（構造化出力が無効な場合のみプロンプトに含める）
+# 構造化出力（format=JSON Schema）が有効な場合は、デコード時点で
+# JSON以外・フィールド欠落・type/answer_boolの誤りが起こらないため不要
+QUIZ_JSON_FORMAT_RULES = """出力ルール:
+- JSONのみ出力（説明文・コードフェンス・コメント禁止）
+- { "quizzes": [...] } の形式のみ
+- quizzes配列は指定個数を必ず含める
+- type: "true_false"（必ずこの文字列。テンプレート名（T3、T6など）ではない）
+- answer_bool: true（常にtrue）
+- citationsはdict形式で指定（例: {"source": "...", "page": ..., "quote": "..."}）
 
-def build_messages(question: str, citations: List[Citation]) -> List[dict[str, str]]:
-    """
-    質問と引用からLLM用のメッセージリストを構築
-    
-    - system方針：根拠に基づく、根拠がなければ分からない
-    - citationsを短く整形してcontextに含める
-    
-    Args:
-        question: 質問文
-        citations: 引用リスト（最大5件）
-        
-    Returns:
-        LLM用メッセージリスト（[{"role": "system", "content": "..."}, ...]）
-    """
-    # systemプロンプト：根拠に基づく回答を指示
-    system_content = """あなたは与えられた根拠（citations）を基に質問に答えるアシスタントです。
-
-原則：
-- 提供された根拠のみを基に回答してください
-- 根拠に含まれていない情報は推測せず、「根拠からは分かりません」と述べてください
-- 根拠が複数ある場合は、それらを統合して回答してください
-- 回答は日本語で、簡潔にまとめてください
-- 回答本文には「根拠1」「(根拠2)」「参照3」などの番号参照を書かないでください（根拠はcitationsとして別に表示されるため、本文は結論と理由を自然な日本語で述べてください）"""  # CHANGED: 番号参照排除の指示を追加
-    
-    # citationsを整形してcontextを作成
-    if len(citations) == 0:
-        context_parts = ["【根拠】\n根拠が見つかりませんでした。"]
-    else:
-        context_parts = ["【根拠】"]
-        for i, citation in enumerate(citations, 1):
-            # sourceとpageの情報
-            source_info = citation.source
-            if citation.page is not None:
-                source_info = f"{citation.source} (p.{citation.page})"
-            
-            # quoteをそのまま使用（既に240文字程度に整形済み）
-            context_parts.append(f"{i}. [{source_info}]\n{citation.quote}")
-    
-    context_text = "\n\n".join(context_parts)
-    
-    # userプロンプト：質問と根拠を提示
-    user_content = f"""以下の質問に、提供された根拠を基に回答してください。
-
-【質問】
-{question}
-
-{context_text}"""
-    
-    # メッセージリストを構築
-    messages = [
-        {"role": "system", "content": system_content},
-        {"role": "user", "content": user_content},
-    ]
-    
-    return messages
-
+"""
 
-def build_quiz_generation_messages(
-    level: Literal["beginner", "intermediate", "advanced"],
-    count: int,
-    topic: str | None,
-    citations: List[Citation],
-    banned_statements: List[str] | None = None,
-) -> tuple[List[dict[str, str]], dict]:
-    """
-    Quiz生成用のメッセージリストを構築
-    
-    - 引用（citations）のみを材料にクイズを生成
-    - JSON形式で出力（厳守）
-    - 引用外の推測は禁止
-    - levelに応じた難易度調整
-    
-    Args:
-        level: 難易度（beginner/intermediate/advanced）
-        count: 生成するクイズの数
-        topic: トピック（オプション）
-        citations: 引用リスト
-        banned_statements: 出力禁止のstatementリスト（既出・重複で落としたもの）
-        
-    Returns:
-        (LLM用メッセージリスト, プロンプト統計情報)
-    """
-    # systemプロンプト：理解度を深めるクイズ生成版
-    system_content = """業務マニュアルから理解度を深めるクイズを作成します。
+# Quiz生成用systemプロンプト（静的部分）
+# 毎回同じ文字列になるため、プロバイダのprefix cacheが効く。
+# リクエストごとに変わる値（難易度・問題数・引用など）はuserプロンプト側に置く。
+QUIZ_GENERATION_SYSTEM_PROMPT = """業務マニュアルから理解度を深めるクイズを作成します。
 
 【重要】言語ルール:
 - すべての出力は日本語で行うこと
 - statement、explanation、すべてのテキストは必ず日本語で出力すること
 - 英語での出力は一切禁止
 
-出力ルール:
-- JSONのみ出力（説明文・コードフェンス・コメント禁止）
-- { "quizzes": [...] } の形式のみ
-- quizzes配列は指定個数を必ず含める
-
 各quizの必須要素:
-- type: "true_false"（必ずこの文字列。テンプレート名（T3、T6など）ではない）
 - statement: 下記テンプレートのいずれかに従う断言文（必ず肯定文のみ、日本語のみ）
-- answer_bool: true（常にtrue）
 - explanation: 理解を深める説明（理由・背景・重要性を含む、最大120文字、日本語のみ）
 - citations: 入力で渡された引用をそのまま使用（dict形式: {"source": "...", "page": ..., "quote": "..."}）
 
@@ -215,11 +141,159 @@ T13: 「【引用に記載されている判断基準1・状況】かつ【引
 
 文脈（状況・条件・タイミング）を含めることで、どのような時にどうする/しないかが明確になり、理解度が深まります。
 
+共通要求（毎回必ず守ること）:
+- quizzes配列には指定された問題数を含める
+- statementは指定された難易度のテンプレートに従う（必ず肯定文のみ、日本語のみ、英語禁止）
+- explanationは難易度別の説明方針に従う（日本語のみ、英語禁止）
+  - beginner: 基本的な理由や重要性を簡潔に説明（最大100文字）
+  - intermediate: 具体的な理由、方法、適用場面を説明（最大120文字）
+  - advanced: 例外ケース、判断基準、リスク管理の観点を含めて説明（最大150文字）
+- 引用に基づく事実のみ（推測禁止）
+- 曖昧表現禁止（場合がある、望ましい等）
+- 否定形・禁止表現は一切使わない（「してはならない」「禁止」などは絶対に使わない）
+- 【重要】前提条件は抽象的（「異常が検出された場合」など）ではなく、引用に記載されている具体的な状況・条件を使用する
+- 【重要】すべてのstatementは「いつ・誰が・何を・どうする」の形式に基づいて作成する
+
+理解度を深める方針:
+- 単純な事実確認ではなく、理由・方法・判断基準を含む内容を優先する
+- 【必須】すべてのstatementには文脈（状況・条件・タイミング・場面）を含めること
+- 初級: 基本的なルールや手順を明確に、どのような状況で適用するかを示す
+- 中級: なぜその行為が必要か、どのように行うか、どの状況で適用するかを説明
+- 上級: 例外ケース、判断基準、リスク管理の観点を含める、複合的な状況での判断を示す
+
+【文脈を含める重要性】
+- 「担当者は対応を行う」→ 文脈が不明確（いつ？どの状況で？）
+- 「機器の温度が設定値を超えた場合、担当者は緊急停止を実行する」→ 文脈が明確（具体的な状況、主体が明確）
+- 「清掃作業開始時において、油汚れがある場合、清掃担当者は専用の清掃剤を使用する」→ より具体的な文脈（具体的な状況、条件・主体が明確）
+
+【重要】引用に含まれている内容のみを使用してください。引用に「火災」「避難」「災害」などのキーワードが含まれていない場合、これらのキーワードをstatementに追加しないでください。
+
+【絶対禁止】
+- 英語での生成（例：「In the event of...」など）は禁止。必ず日本語で生成してください。
+- 抽象的表現（「異常が検出された場合」「特定の条件が満たされた場合」など）は禁止。引用に記載されている具体的な表現を使用してください。
+
+重要: 引用に「してはならない」などの禁止表現があっても、statementでは必ず肯定文に変換すること。
+例: 引用が「二重書き込みをしてはならない」の場合、statementは「ファイル編集時は必ず一人で行う」のように肯定文にする。
+
 """
 
-    # citationsを制限・整形（厳格なタイムアウト対策）
-    from app.core.settings import settings
+# levelごとのテンプレート指定（userプロンプトでは該当levelの1行だけを指す）
+QUIZ_LEVEL_TEMPLATES = {
+    "beginner": "T3またはT4（基本的事実の確認）",
+    "intermediate": "T6、T7、T8、T9のいずれか（理由・方法・適用場面を問う）",
+    "advanced": "T10、T11、T12、T13のいずれか（例外・判断基準・リスクを問う）",
+}
+
+# levelごとの説明方針
+QUIZ_EXPLANATION_GUIDANCE = {
+    "beginner": "基本的な理由や重要性を簡潔に説明（最大100文字）",
+    "intermediate": "具体的な理由、方法、適用場面を説明（最大120文字）",
+    "advanced": "例外ケース、判断基準、リスク管理の観点を含めて説明（最大150文字）",
+}
+
+
+def is_quiz_output_schema_enabled() -> bool:
+    """
+    Quiz生成で構造化出力（JSON Schema）を使うかどうか
+
+    Returns:
+        True: format にJSON Schemaを渡す（形式ルールのプロンプト記載を省略）
+    """
+    return settings.quiz_force_json and settings.quiz_json_schema
+
+
+def build_messages(question: str, citations: List[Citation]) -> List[dict[str, str]]:
+    """
+    質問と引用からLLM用のメッセージリストを構築
+    
+    - system方針：根拠に基づく、根拠がなければ分からない
+    - citationsを短く整形してcontextに含める
+    
+    Args:
+        question: 質問文
+        citations: 引用リスト（最大5件）
+        
+    Returns:
+        LLM用メッセージリスト（[{"role": "system", "content": "..."}, ...]）
+    """
+    # systemプロンプト：根拠に基づく回答を指示
+    system_content = """あなたは与えられた根拠（citations）を基に質問に答えるアシスタントです。
+
+原則：
+- 提供された根拠のみを基に回答してください
+- 根拠に含まれていない情報は推測せず、「根拠からは分かりません」と述べてください
+- 根拠が複数ある場合は、それらを統合して回答してください
+- 回答は日本語で、簡潔にまとめてください
+- 回答本文には「根拠1」「(根拠2)」「参照3」などの番号参照を書かないでください（根拠はcitationsとして別に表示されるため、本文は結論と理由を自然な日本語で述べてください）"""  # CHANGED: 番号参照排除の指示を追加
+    
+    # citationsを整形してcontextを作成
+    if len(citations) == 0:
+        context_parts = ["【根拠】\n根拠が見つかりませんでした。"]
+    else:
+        context_parts = ["【根拠】"]
+        for i, citation in enumerate(citations, 1):
+            # sourceとpageの情報
+            source_info = citation.source
+            if citation.page is not None:
+                source_info = f"{citation.source} (p.{citation.page})"
+            
+            # quoteをそのまま使用（既に240文字程度に整形済み）
+            context_parts.append(f"{i}. [{source_info}]\n{citation.quote}")
+    
+    context_text = "\n\n".join(context_parts)
+    
+    # userプロンプト：質問と根拠を提示
+    user_content = f"""以下の質問に、提供された根拠を基に回答してください。
+
+【質問】
+{question}
+
+{context_text}"""
+    
+    # メッセージリストを構築
+    messages = [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_content},
+    ]
+    
+    return messages
+
+
+def build_quiz_generation_messages(
+    level: Literal["beginner", "intermediate", "advanced"],
+    count: int,
+    topic: str | None,
+    citations: List[Citation],
+    banned_statements: List[str] | None = None,
+) -> tuple[List[dict[str, str]], dict]:
+    """
+    Quiz生成用のメッセージリストを構築
+    
+    - 引用（citations）のみを材料にクイズを生成
+    - JSON形式で出力（厳守）
+    - 引用外の推測は禁止
+    - levelに応じた難易度調整
+    
+    Args:
+        level: 難易度（beginner/intermediate/advanced）
+        count: 生成するクイズの数
+        topic: トピック（オプション）
+        citations: 引用リスト
+        banned_statements: 出力禁止のstatementリスト（既出・重複で落としたもの）
+        
+    Returns:
+        (LLM用メッセージリスト, プロンプト統計情報)
+    """
+    # systemプロンプト（静的、プロバイダのprefix cache対象）
+    system_content = QUIZ_GENERATION_SYSTEM_PROMPT
+
+    # 構造化出力が無効な場合のみ、JSON形式のルールをプロンプトで指示する
+    # （設定で固定のため、こちらも毎回同じ文字列になる）
+    schema_enabled = is_quiz_output_schema_enabled()
+    if not schema_enabled:
+        system_content = system_content + QUIZ_JSON_FORMAT_RULES
     
+    # citationsを制限・整形（厳格なタイムアウト対策）
     # LLMへ渡すcitations数を制限
     max_citations = settings.quiz_context_top_n
     max_quote_len = settings.quiz_quote_max_len
@@ -259,21 +333,9 @@ T13: 「【引用に記載されている判断基準1・状況】かつ【引
         
         context_text = "\n\n".join(context_parts)
     
-    # levelごとのテンプレート指定（理解度を深める形式）
-    level_templates = {
-        "beginner": "T3またはT4（基本的事実の確認）",
-        "intermediate": "T6、T7、T8、T9のいずれか（理由・方法・適用場面を問う）",
-        "advanced": "T10、T11、T12、T13のいずれか（例外・判断基準・リスクを問う）",
-    }
-    allowed_templates = level_templates.get(level, "T3またはT4")
-    
-    # levelごとの説明方針
-    explanation_guidance = {
-        "beginner": "基本的な理由や重要性を簡潔に説明（最大100文字）",
-        "intermediate": "具体的な理由、方法、適用場面を説明（最大120文字）",
-        "advanced": "例外ケース、判断基準、リスク管理の観点を含めて説明（最大150文字）",
-    }
-    explanation_guide = explanation_guidance.get(level, "基本的な理由や重要性を簡潔に説明")
+    # levelごとのテンプレート・説明方針（詳細はsystemプロンプトに記載済み）
+    allowed_templates = QUIZ_LEVEL_TEMPLATES.get(level, "T3またはT4")
+    explanation_guide = QUIZ_EXPLANATION_GUIDANCE.get(level, "基本的な理由や重要性を簡潔に説明")
     
     # topicの扱い
     topic_text = f"トピック: {topic}\n" if topic else ""
@@ -288,56 +350,16 @@ T13: 「【引用に記載されている判断基準1・状況】かつ【引
         elif len(unique_sources) > 1:
             source_constraint = f"\n【重要】指定されたsourceのみを使用してください。\n指定source: {', '.join(unique_sources)}\n他のsourceの内容を含めないでください。\n"
     
-    # userプロンプト（理解度を深める版）
-    user_content = f"""JSONのみ出力。説明文禁止。
-
-【重要】言語ルール:
-- すべての出力は日本語で行うこと
-- statement、explanation、すべてのテキストは必ず日本語で出力すること
-- 英語での出力は一切禁止
-
-条件:
-{topic_text}難易度: {level}
-問題数: {count}個（短い出力で確実に返す）
-使用テンプレート: {allowed_templates}
+    # JSON形式の指示（構造化出力が無効な場合のみ）
+    json_only_head = "" if schema_enabled else "JSONのみ出力。説明文禁止。\n\n"
+    
+    # userプロンプト（可変スロットのみ。静的な要求・方針はsystemプロンプト側）
+    user_content = f"""{json_only_head}条件:
+{topic_text}今回の難易度: {level} → {allowed_templates} を使用
+問題数: {count}個（quizzes配列に{count}個含める、短い出力で確実に返す）
+explanation: {explanation_guide}
 {source_constraint}
 {context_text}
-
-要求:
-- quizzes配列に{count}個含める
-- typeは必ず"true_false"（テンプレート名（T3、T6など）ではない）
-- statementは{allowed_templates}のテンプレートに従う（必ず肯定文のみ、日本語のみ、英語禁止）
-- answer_boolは全てtrue
-- explanationは{explanation_guide}（日本語のみ、英語禁止）
-- citationsはdict形式で指定（例: {{"source": "...", "page": ..., "quote": "..."}}）
-- 引用に基づく事実のみ（推測禁止）
-- 曖昧表現禁止（場合がある、望ましい等）
-- 否定形・禁止表現は一切使わない（「してはならない」「禁止」などは絶対に使わない）
-- 【重要】前提条件は抽象的（「異常が検出された場合」など）ではなく、引用に記載されている具体的な状況・条件を使用する
-- 【重要】すべてのstatementは「いつ・誰が・何を・どうする」の形式に基づいて作成する
-
-理解度を深める方針:
-- 単純な事実確認ではなく、理由・方法・判断基準を含む内容を優先する
-- 【必須】すべてのstatementには文脈（状況・条件・タイミング・場面）を含めること
-- 初級: 基本的なルールや手順を明確に、どのような状況で適用するかを示す
-- 中級: なぜその行為が必要か、どのように行うか、どの状況で適用するかを説明
-- 上級: 例外ケース、判断基準、リスク管理の観点を含める、複合的な状況での判断を示す
-
-【文脈を含める重要性】
-- 「担当者は対応を行う」→ 文脈が不明確（いつ？どの状況で？）
-- 「機器の温度が設定値を超えた場合、担当者は緊急停止を実行する」→ 文脈が明確（具体的な状況、主体が明確）
-- 「清掃作業開始時において、油汚れがある場合、清掃担当者は専用の清掃剤を使用する」→ より具体的な文脈（具体的な状況、条件・主体が明確）
-
-【重要】引用に含まれている内容のみを使用してください。引用に「火災」「避難」「災害」などのキーワードが含まれていない場合、これらのキーワードをstatementに追加しないでください。
-
-【絶対禁止】
-- 英語での生成（例：「In the event of...」など）は禁止。必ず日本語で生成してください。
-- 抽象的表現（「異常が検出された場合」「特定の条件が満たされた場合」など）は禁止。引用に記載されている具体的な表現を使用してください。
-- テンプレート名（T3、T6など）をtypeフィールドに入れないでください。typeは必ず"true_false"です。
-
-重要: 引用に「してはならない」などの禁止表現があっても、statementでは必ず肯定文に変換すること。
-例: 引用が「二重書き込みをしてはならない」の場合、statementは「ファイル編集時は必ず一人で行う」のように肯定文にする。
-
 """
     
     # banned_statementsをプロンプトに追加
@@ -346,7 +368,8 @@ T13: 「【引用に記載されている判断基準1・状況】かつ【引
         banned_list = "\n".join(f"- {s[:80]}..." if len(s) > 80 else f"- {s}" for s in banned_statements[:30])
         banned_section = f"\n\n[出力禁止] 以下のstatementは既に生成済みまたは重複で除外されたため、同一/類似のstatementを出力しないこと:\n{banned_list}\n"
     
-    user_content = user_content + banned_section + "\n{{ \"quizzes\": [...] }}のみ出力。短く書く。"""
+    output_tail = "\n短く書く。" if schema_enabled else "\n{ \"quizzes\": [...] }のみ出力。短く書く。"
+    user_content = user_content + banned_section + output_tail
     
     messages = [
         {"role": "system", "content": system_content},
@@ -407,8 +430,6 @@ def build_quiz_json_fix_messages(
 前回エラー: {previous_error}"""
 
     # citationsを制限・整形（厳格なタイムアウト対策）
-    from app.core.settings import settings
-    
     # LLMへ渡すcitations数を制限
     max_citations = settings.quiz_context_top_n
     max_quote_len = settings.quiz_quote_max_len
@@ -451,12 +472,7 @@ def build_quiz_json_fix_messages(
     topic_text = f"トピック: {topic}\n" if topic else ""
     
     # userプロンプト（簡潔版、理解度を深める説明を含む）
-    explanation_guidance_fix = {
-        "beginner": "基本的な理由や重要性を簡潔に説明（最大100文字）",
-        "intermediate": "具体的な理由、方法、適用場面を説明（最大120文字）",
-        "advanced": "例外ケース、判断基準、リスク管理の観点を含めて説明（最大150文字）",
-    }
-    explanation_guide_fix = explanation_guidance_fix.get(level, "基本的な理由や重要性を簡潔に説明（最大100文字）")
+    explanation_guide_fix = QUIZ_EXPLANATION_GUIDANCE.get(level, "基本的な理由や重要性を簡潔に説明（最大100文字）")
     
     user_content = f"""JSONのみ出力。
 
@@ -6,6 +6,7 @@ Chromaから sourceごとの chunk id一覧を作り、必要な分だけ取り
 """
 import logging
 import random
+import sys
 import threading
 import unicodedata
 from typing import Dict, List, Optional
@@ -27,6 +28,7 @@ def build_pool(collection: chromadb.Collection) -> Dict[str, List[str]]:
     sourceごとの chunk ID poolを作成（メモリキャッシュ）
     
     Unicode正規化(NFC)で source を揃えてキー化（NFD/NFC混在対策）
+    メモリ対策: chunk id / source キーは sys.intern() して同一文字列を共有する
     大規模対策:
     - 1sourceあたり最大 quiz_pool_max_ids_per_source まで保持
     - バッチ取得（offset/limit）で全件一括を避ける
@@ -74,14 +76,16 @@ def build_pool(collection: chromadb.Collection) -> Dict[str, List[str]]:
             for chunk_id, metadata in zip(ids, metadatas):
                 source_raw = metadata.get("source", "unknown")
                 # NFC正規化（macOS NFD対策）
-                source_norm = unicodedata.normalize("NFC", source_raw)
+                # intern しておくと dict の検索がポインタ比較で済む
+                source_norm = sys.intern(unicodedata.normalize("NFC", source_raw))
                 
                 if source_norm not in pool:
                     pool[source_norm] = []
                 
                 # 大規模対策: 1sourceあたり max_ids_per_source まで
+                # chunk idはバッチごとに新しいstrで返るため intern して重複を共有
                 if len(pool[source_norm]) < max_ids_per_source:
-                    pool[source_norm].append(chunk_id)
+                    pool[source_norm].append(sys.intern(chunk_id))
             
             offset += len(ids)
             logger.info(f"[ChunkPool] バッチ処理中: {offset}/{total_count}")
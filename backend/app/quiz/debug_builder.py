@@ -11,6 +11,9 @@ from app.schemas.quiz import QuizGenerateRequest
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# aggregated_statsのうち、debugレスポンスでは専用フィールドとして返すキー
+_STATS_KEYS_EMITTED_ELSEWHERE = frozenset(("rejected_count", "reject_reason_counts"))
+
 
 def build_error_response(
     request: QuizGenerateRequest,
@@ -28,26 +31,20 @@ def build_error_response(
     Returns:
         デバッグ情報の辞書
     """
-    debug_info: Dict[str, Any] = {
+    # 1つの辞書リテラルで構築（retrieval側のデバッグ情報があれば展開し、requestは常に上書き）
+    return {
         "error": {
             "type": "retrieval_failed",
             "message": error_message,
         },
+        **(quiz_debug_info or {}),
+        "request": {
+            "level": request.level,
+            "count": request.count,
+            "topic": request.topic,
+            "source_ids": request.source_ids,
+        },
     }
-    
-    # retrieval側のデバッグ情報があれば追加
-    if quiz_debug_info:
-        debug_info.update(quiz_debug_info)
-    
-    # リクエスト情報を追加
-    debug_info["request"] = {
-        "level": request.level,
-        "count": request.count,
-        "topic": request.topic,
-        "source_ids": request.source_ids,
-    }
-    
-    return debug_info
 
 
 def build_debug_response(
@@ -74,7 +71,7 @@ def build_debug_response(
         target_count: 目標生成数
         citations_count: 引用数
         accepted_count: 採用されたクイズ数
-        rejected_items: バリデーション失敗したアイテム情報のリスト
+        rejected_items: バリデーション失敗したアイテム情報のリスト（生成側で件数制限済み）
         error_info: エラー情報
         attempts: 試行回数
         attempt_errors: 試行ごとの失敗履歴
@@ -86,7 +83,12 @@ def build_debug_response(
     Returns:
         デバッグ情報の辞書
     """
-    debug_info: Dict[str, Any] = {
+    # reject件数と理由の内訳（全件分）は生成側で集計済み
+    rejected_count = aggregated_stats.get("rejected_count", len(rejected_items))
+    reject_reason_counts = aggregated_stats.get("reject_reason_counts", {})
+    
+    # 1つの辞書リテラルで構築（任意のセクションは値がある場合のみ展開）
+    return {
         "request": {
             "level": request.level,
             "count": request.count,
@@ -97,52 +99,39 @@ def build_debug_response(
         "retrieval": {
             "citations_count": citations_count,
             "elapsed_ms": round(t_retrieval_ms, 1),
+            # retrieval側のデバッグ情報があれば追加
+            **(quiz_debug_info or {}),
         },
         "generation": {
             "accepted_count": accepted_count,
             "target_count": target_count,
-            "rejected_count": len(rejected_items),
+            "rejected_count": rejected_count,
             "attempts": attempts,
             "elapsed_ms": round(t_llm_ms, 1),
         },
         "total": {
             "elapsed_ms": round(t_total_ms, 1),
         },
+        # エラー情報があれば追加
+        **({"error": error_info} if error_info else {}),
+        # 試行エラーがあれば追加
+        **({"attempt_errors": attempt_errors} if attempt_errors else {}),
+        # バリデーション失敗アイテムがあれば追加
+        **({
+            "rejected_items": rejected_items,
+            "reject_reason_counts": reject_reason_counts,
+        } if rejected_items else {}),
+        # 集計統計情報を追加（rejected_count / reject_reason_counts は上の専用フィールドで返すので重複させない）
+        **({"stats": {
+            key: value for key, value in aggregated_stats.items()
+            if key not in _STATS_KEYS_EMITTED_ELSEWHERE
+        }} if aggregated_stats else {}),
+        # 不足情報を追加（規定数に達していない場合）
+        **({
+            "shortage": {
+                "requested": target_count,
+                "accepted": accepted_count,
+                "shortage_count": target_count - accepted_count,
+            },
+        } if accepted_count < target_count else {}),
     }
-    
-    # retrieval側のデバッグ情報があれば追加
-    if quiz_debug_info:
-        debug_info["retrieval"].update(quiz_debug_info)
-    
-    # エラー情報があれば追加
-    if error_info:
-        debug_info["error"] = error_info
-    
-    # 試行エラーがあれば追加
-    if attempt_errors:
-        debug_info["attempt_errors"] = attempt_errors
-    
-    # バリデーション失敗アイテムがあれば追加
-    if rejected_items:
-        debug_info["rejected_items"] = rejected_items[:10]  # 最大10件まで
-        
-        # reject理由の内訳を集計
-        reject_reason_counts = {}
-        for item in rejected_items:
-            reason = item.get("reason", "unknown")
-            reject_reason_counts[reason] = reject_reason_counts.get(reason, 0) + 1
-        debug_info["reject_reason_counts"] = reject_reason_counts
-    
-    # 集計統計情報を追加
-    if aggregated_stats:
-        debug_info["stats"] = aggregated_stats
-    
-    # 不足情報を追加（規定数に達していない場合）
-    if accepted_count < target_count:
-        debug_info["shortage"] = {
-            "requested": target_count,
-            "accepted": accepted_count,
-            "shortage_count": target_count - accepted_count,
-        }
-    
-    return debug_info
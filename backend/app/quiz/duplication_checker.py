@@ -1,33 +1,74 @@
 """
 重複チェックロジック
 
-クイズのstatementとcitationの重複をチェックする。
+クイズのstatementの重複をチェックする。
+（citationの重複判定キーはCitation.dedup_keyに一本化）
 """
 import logging
 import re
 import unicodedata
-
-from app.schemas.common import Citation
+from functools import lru_cache
 
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# 空白（正規表現の\sと同じ文字集合）と句読点を除去する変換テーブル（str.translateで1パス処理）
+# Unicodeの空白文字はすべてU+3000（全角空白）以下にあるため、その範囲だけを列挙する
+_NORM_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(0x3001)) if c.isspace()) + '。、.,')
+
+# 否定語パターン（1つの選択パターンにまとめて1パスで除去）
+# 長いものを先に並べ、左から最初に一致した選択肢が優先される点に対応する
+_NEGATION_PATTERNS = (
+    '行ってはいけない',
+    '行ってはならない',
+    'してはいけない',
+    'してはならない',
+    'なくてもよい',
+    '行わない',
+    'ではない',
+    'しない',
+    '禁止',
+    '不要',
+)
+_NEG_RE = re.compile('|'.join(_NEGATION_PATTERNS))
+
+# statement -> 重複判定キーのキャッシュ件数（リトライで同じstatementが繰り返し来るため）
+STATEMENT_KEY_CACHE_SIZE = 4096
+
+# 近似重複判定に使う文字n-gramの長さ
+SHINGLE_SIZE = 3
+
+
+def canonicalize_statement(statement: str) -> str:
+    """
+    statementをUnicode正規化（NFKC）する
+
+    全角英数字・全角空白・全角記号を半角に揃える。
+    StatementIndexへの登録時/照合時に1回だけ適用する。
+
+    Args:
+        statement: クイズのstatement
+
+    Returns:
+        NFKC正規化されたstatement
+    """
+    return unicodedata.normalize('NFKC', statement)
+
 
 def normalize_statement(statement: str) -> str:
     """
     statementを正規化して比較用に使用
     
+    NFKC正規化済み（canonicalize_statement適用後）のstatementを想定する。
+    
     Args:
         statement: クイズのstatement
         
     Returns:
         正規化されたstatement（空白除去、句読点統一、小文字化）
     """
-    # 空白を除去
-    normalized = re.sub(r'\s+', '', statement)
-    # 句読点を統一（句読点を除去）
-    normalized = normalized.replace('。', '').replace('、', '').replace('.', '').replace(',', '')
-    return normalized.lower()
+    # 空白と句読点を1パスで除去
+    return statement.translate(_NORM_TABLE).lower()
 
 
 def get_core_content_key(statement: str) -> str:
@@ -37,6 +78,7 @@ def get_core_content_key(statement: str) -> str:
     重複判定用に、否定語（しない/行わない/禁止/不要/ではない等）を除去した
     コア内容のみで比較する。これにより「行う/行わない」の単純反転が
     同一セットに混入しないようにする。
+    NFKC正規化済み（canonicalize_statement適用後）のstatementを想定する。
     
     Args:
         statement: クイズのstatement
@@ -44,104 +86,150 @@ def get_core_content_key(statement: str) -> str:
     Returns:
         コア内容キー（否定語除去後の正規化）
     """
-    # 否定語パターン（優先度順）
-    negation_patterns = [
-        r'しない',
-        r'行わない',
-        r'ではない',
-        r'なくてもよい',
-        r'禁止',
-        r'不要',
-        r'してはいけない',
-        r'行ってはいけない',
-        r'してはならない',
-        r'行ってはならない',
-    ]
-    
-    # 否定語を除去
-    core = statement
-    for pattern in negation_patterns:
-        core = re.sub(pattern, '', core)
+    # 否定語を除去（全パターンを1回の走査で除去）
+    core = _NEG_RE.sub('', statement)
     
     # 正規化（空白除去、句読点除去、小文字化）
-    normalized = re.sub(r'\s+', '', core)
-    normalized = normalized.replace('。', '').replace('、', '').replace('.', '').replace(',', '')
-    return normalized.lower()
+    return core.translate(_NORM_TABLE).lower()
+
+
+@lru_cache(maxsize=STATEMENT_KEY_CACHE_SIZE)
+def _normalized_key(statement: str) -> str:
+    """
+    完全一致判定キー（NFKC正規化後の正規化済みstatement）を計算
+
+    純粋関数なので@lru_cacheで結果を再利用する。
+    """
+    return normalize_statement(canonicalize_statement(statement))
+
+
+@lru_cache(maxsize=STATEMENT_KEY_CACHE_SIZE)
+def _core_key(statement: str) -> str:
+    """
+    コア内容一致判定キー（NFKC正規化後のコア内容キー）を計算
+
+    否定語除去の正規表現を含むため、完全一致で判定できない場合のみ呼ぶ。
+    純粋関数なので@lru_cacheで結果を再利用する。
+    """
+    return get_core_content_key(canonicalize_statement(statement))
+
+
+def _shingles(normalized: str) -> frozenset[str]:
+    """
+    正規化済みstatementを文字n-gram（SHINGLE_SIZE文字）の集合に分解する
 
+    n文字未満の短い文はそれ自体を1要素とする。
+    """
+    if len(normalized) < SHINGLE_SIZE:
+        return frozenset((normalized,)) if normalized else frozenset()
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+
+class StatementIndex:
+    """
+    採用済みstatementの重複チェック用インデックス
+
+    採用時に正規化済みstatementとコア内容キーを1回だけ計算して保持し、
+    新しいstatementの重複チェックをハッシュ検索（O(1)）で行う。
+    （既存statementを毎回正規化し直す線形走査を避ける）
+    キー計算の前にNFKC正規化を1回だけ行い、全角/半角の違いを吸収する。
+    near_duplicate_thresholdを指定した場合は、ハッシュ検索で一致しなかった
+    statementに対して文字n-gramのJaccard類似度による近似重複判定も行う。
+    （助詞や数字だけが違う言い換えを検出する。採用済みは1リクエストで数十件程度のため線形走査）
+    """
+
+    def __init__(self, near_duplicate_threshold: float = 0.0) -> None:
+        """
+        Args:
+            near_duplicate_threshold: 近似重複とみなすJaccard類似度の閾値（0以下で近似重複判定を無効化）
+        """
+        # 正規化済みstatement -> 元のstatement（ログ出力用）
+        self._normalized: dict[str, str] = {}
+        # コア内容キー -> 元のstatement（ログ出力用）
+        self._core_keys: dict[str, str] = {}
+        # 近似重複判定用: (n-gram集合, 元のstatement) のリスト（判定が有効な場合のみ保持）
+        self._near_duplicate_threshold = near_duplicate_threshold
+        self._shingle_sets: list[tuple[frozenset[str], str]] = []
+
+    def __len__(self) -> int:
+        return len(self._normalized)
+
+    def add(self, statement: str) -> None:
+        """
+        採用したstatementを登録する
+
+        Args:
+            statement: 採用したクイズのstatement
+        """
+        normalized = _normalized_key(statement)
+        if normalized not in self._normalized:
+            self._normalized[normalized] = statement
+            if self._near_duplicate_threshold > 0:
+                self._shingle_sets.append((_shingles(normalized), statement))
+        core_key = _core_key(statement)
+        if core_key:  # 空文字列は重複判定に使わない
+            self._core_keys.setdefault(core_key, statement)
+
+    def find_duplicate(self, new_statement: str) -> tuple[str, str] | None:
+        """
+        重複している既存statementを探す
+
+        Args:
+            new_statement: 新しいstatement
+
+        Returns:
+            (重複種別, 既存statement) のタプル。重複がなければNone
+            - 重複種別: "exact"（完全一致）、"core"（コア内容一致）または "near"（近似重複）
+        """
+        # 安価な完全一致判定を先に行い、一致すればコア内容キーは計算しない
+        normalized = _normalized_key(new_statement)
+        existing = self._normalized.get(normalized)
+        if existing is not None:
+            return ("exact", existing)
+
+        core_key = _core_key(new_statement)
+        if core_key:
+            existing = self._core_keys.get(core_key)
+            if existing is not None:
+                return ("core", existing)
+
+        # 近似重複判定（閾値が0以下なら走査しない。ハッシュ検索で見つからなかったときだけ行う）
+        if self._near_duplicate_threshold > 0 and self._shingle_sets:
+            shingles = _shingles(normalized)
+            if shingles:
+                for existing_shingles, existing in self._shingle_sets:
+                    union = len(shingles | existing_shingles)
+                    if union and len(shingles & existing_shingles) / union >= self._near_duplicate_threshold:
+                        return ("near", existing)
 
-def is_duplicate_statement(new_statement: str, existing_statements: list[str]) -> bool:
+        return None
+
+
+def is_duplicate_statement(new_statement: str, existing_statements: StatementIndex) -> bool:
     """
     新しいstatementが既存のものと重複しているかチェック
     
     重複判定は2段階で行う:
     1. 通常の正規化（空白・句読点除去）で完全一致チェック
     2. コア内容キー（否定語除去後）で一致チェック（「行う/行わない」の単純反転を検出）
+    （インデックスで近似重複判定が有効な場合は、3. 文字n-gramのJaccard類似度で近似重複チェック）
     
     Args:
         new_statement: 新しいstatement
-        existing_statements: 既存のstatementリスト
+        existing_statements: 採用済みstatementのインデックス
         
     Returns:
         True: 重複している、False: 重複していない
     """
-    # 1. 通常の正規化で完全一致チェック
-    normalized_new = normalize_statement(new_statement)
-    for existing in existing_statements:
-        normalized_existing = normalize_statement(existing)
-        if normalized_new == normalized_existing:
-            logger.info(f"重複検出（完全一致）: '{new_statement[:50]}...' と '{existing[:50]}...' が重複しています")
-            return True
-    
-    # 2. コア内容キー（否定語除去後）で一致チェック
-    core_key_new = get_core_content_key(new_statement)
-    for existing in existing_statements:
-        core_key_existing = get_core_content_key(existing)
-        if core_key_new == core_key_existing and core_key_new:  # 空文字列は除外
-            logger.info(f"重複検出（コア内容一致）: '{new_statement[:50]}...' と '{existing[:50]}...' がコア内容で重複しています")
-            return True
-    
-    return False
-
-
-def is_citation_duplicate(quiz_citations: list[Citation], used_citation_keys: set) -> bool:
-    """
-    クイズのcitationsが既に使用済みかチェック
+    duplicate = existing_statements.find_duplicate(new_statement)
+    if duplicate is None:
+        return False
     
-    Args:
-        quiz_citations: クイズのcitationsリスト
-        used_citation_keys: 使用済みcitationキーのセット
-        
-    Returns:
-        True: 重複している（既に使用済みのcitationを含む）、False: 重複していない
-    """
-    for citation in quiz_citations:
-        citation_key = (
-            citation.source,
-            citation.page,
-            citation.quote[:60] if citation.quote else ""
-        )
-        if citation_key in used_citation_keys:
-            # TypeError対策: pageを文字列に変換
-            page_str = str(citation.page) if citation.page is not None else "None"
-            logger.info(
-                f"出題箇所重複検出: '{citation.source}' (p.{page_str}) は既に使用済みです"
-            )
-            return True
-    return False
-
-
-def create_citation_key(citation: Citation) -> tuple:
-    """
-    citationから重複チェック用のキーを生成
-    
-    Args:
-        citation: Citationオブジェクト
-        
-    Returns:
-        (source, page, quote_prefix) のタプル
-    """
-    return (
-        citation.source,
-        citation.page,
-        citation.quote[:60] if citation.quote else ""
-    )
+    kind, existing = duplicate
+    if kind == "exact":
+        logger.debug("重複検出（完全一致）: '%s...' と '%s...' が重複しています", new_statement[:50], existing[:50])
+    elif kind == "near":
+        logger.debug("重複検出（近似重複）: '%s...' と '%s...' が近似重複しています", new_statement[:50], existing[:50])
+    else:
+        logger.debug("重複検出（コア内容一致）: '%s...' と '%s...' がコア内容で重複しています", new_statement[:50], existing[:50])
+    return True
@@ -152,7 +152,7 @@ async def generate_and_validate_quizzes(
     # CHANGED: count=1の場合でも○と×の両方を返す（generation_handler.pyで管理するため）
     # generation_handler.pyで5問生成する場合、各試行で○と×の両方が必要
     # そのため、ここでは○と×の両方を返す（スライスしない）
-    logger.info(f"後処理済みクイズ: {len(accepted)}件（○={len(accepted_true)}件, ×={len(accepted_false)}件）")
+    logger.info("後処理済みクイズ: %s件（○=%s件, ×=%s件）", len(accepted), len(accepted_true), len(accepted_false))
     
     return (accepted, rejected, attempt_errors, generation_stats)
 
@@ -111,7 +111,7 @@ async def generate_quizzes_with_llm(
         prompt_stats["llm_output_chars"] = len(response_text)
         prompt_stats["llm_output_preview_head"] = response_text[:200]
         
-        logger.info(f"LLM生成完了: {len(response_text) if response_text else 0}文字")
+        logger.info("LLM生成完了: %s文字", len(response_text) if response_text else 0)
         
         # JSONパース（堅牢版、count件に制限）
         t_parse_start = time.perf_counter()
@@ -120,7 +120,7 @@ async def generate_quizzes_with_llm(
         
         # パース成功の場合
         if parse_error is None and len(quizzes) > 0:
-            logger.info(f"Quiz生成成功: {len(quizzes)}件")
+            logger.info("Quiz生成成功: %s件", len(quizzes))
             return (quizzes, attempt_errors, prompt_stats)
         
         # パース失敗の場合 → JSON修復リトライへ
@@ -166,7 +166,7 @@ async def generate_quizzes_with_llm(
                 prompt_stats["llm_output_chars"] = len(fix_response_text)
                 prompt_stats["llm_output_preview_head"] = fix_response_text[:200]
                 
-                logger.info(f"JSON修復LLM完了: {len(fix_response_text)}文字")
+                logger.info("JSON修復LLM完了: %s文字", len(fix_response_text))
                 
                 # JSONパース（修復版、count件に制限）
                 t_fix_parse_start = time.perf_counter()
@@ -175,7 +175,7 @@ async def generate_quizzes_with_llm(
                 
                 # 修復成功の場合
                 if fix_parse_error is None and len(fix_quizzes) > 0:
-                    logger.info(f"JSON修復成功: {len(fix_quizzes)}件")
+                    logger.info("JSON修復成功: %s件", len(fix_quizzes))
                     
                     # attempt_errors に修復成功を記録
                     attempt_errors.append({
@@ -0,0 +1,113 @@
+"""
+○→×変換ルール（データのみ）
+
+Mutator（make_false_statement）とフォールバック（generate_false_statement_with_fallback）が
+共有する変換ルールを1か所にまとめる。ルールは変更されない前提でタプルで保持する。
+"""
+
+# 反転ルール（優先度順）
+NEGATION_RULES = (
+    # 数値の反転（+1 / -1）
+    (r"(\d+)個", lambda m: f"{int(m.group(1)) + 1}個"),
+    (r"(\d+)件", lambda m: f"{int(m.group(1)) + 1}件"),
+    (r"(\d+)回", lambda m: f"{int(m.group(1)) + 1}回"),
+    (r"(\d+)日", lambda m: f"{int(m.group(1)) + 1}日"),
+    (r"(\d+)時間", lambda m: f"{int(m.group(1)) + 1}時間"),
+    (r"(\d+)分", lambda m: f"{int(m.group(1)) + 1}分"),
+    (r"(\d+)秒", lambda m: f"{int(m.group(1)) + 1}秒"),
+    (r"(\d+)人", lambda m: f"{int(m.group(1)) + 1}人"),
+    (r"(\d+)円", lambda m: f"{int(m.group(1)) + 1}円"),
+    
+    # 禁止・許可の反転
+    ("禁止されている", "許可されている"),
+    ("禁止である", "許可される"),
+    ("禁止する", "許可する"),
+    ("してはいけない", "してもよい"),
+    ("してはならない", "してもよい"),
+    ("行ってはいけない", "行ってもよい"),
+    ("行ってはならない", "行ってもよい"),
+    
+    # 必須・任意の反転
+    ("必ず行う", "行わなくてもよい"),
+    ("必ず確認する", "確認しなくてもよい"),
+    ("必ず連絡する", "連絡しなくてもよい"),
+    ("必ず報告する", "報告しなくてもよい"),
+    ("必ず持つ", "持たなくてもよい"),
+    ("必ず携帯する", "携帯しなくてもよい"),
+    ("必ず所持する", "所持しなくてもよい"),
+    ("必須である", "任意である"),
+    ("必要である", "不要である"),
+    ("必要がある", "必要がない"),
+    
+    # 順序の反転
+    ("最初に", "最後に"),
+    ("第一に", "第二に"),
+    ("先に", "後に"),
+    ("前に", "後に"),
+    
+    # その他の反転
+    ("すべて", "一部"),
+    ("常に", "時には"),
+    ("すぐに", "後で"),
+    ("直ちに", "後で"),
+    ("即座に", "後で"),
+    
+    # 動詞の否定形（より多くのパターンに対応）
+    ("行う", "行わない"),
+    ("確認する", "確認しない"),
+    ("連絡する", "連絡しない"),
+    ("報告する", "報告しない"),
+    ("実施する", "実施しない"),
+    ("実行する", "実行しない"),
+    ("処理する", "処理しない"),
+    ("対応する", "対応しない"),
+    ("検討する", "検討しない"),
+    ("検証する", "検証しない"),
+    ("記録する", "記録しない"),
+    ("保存する", "保存しない"),
+    ("送信する", "送信しない"),
+    ("受信する", "受信しない"),
+    ("作成する", "作成しない"),
+    ("更新する", "更新しない"),
+    ("削除する", "削除しない"),
+    ("取得する", "取得しない"),
+    ("設定する", "設定しない"),
+    ("変更する", "変更しない"),
+    
+    # 形容詞・名詞の否定形（「必要である」「必須である」は上の必須・任意の反転で処理済み）
+    ("重要である", "重要でない"),
+    ("適切である", "不適切である"),
+    ("正しい", "誤り"),
+    ("正確である", "不正確である"),
+    ("有効である", "無効である"),
+    ("可能である", "不可能である"),
+)
+
+# 文末の否定化ルール（文末, 置換後）
+# すべて固定文字列の文末一致なので正規表現は使わず str.endswith で判定する
+# 長い文末から順に並べる（「確認する。」を「する。」より先に判定するため）
+SUFFIX_NEGATION_RULES = (
+    ("確認する。", "確認しない。"),
+    ("連絡する。", "連絡しない。"),
+    ("報告する。", "報告しない。"),
+    ("実施する。", "実施しない。"),
+    ("実行する。", "実行しない。"),
+    ("処理する。", "処理しない。"),
+    ("対応する。", "対応しない。"),
+    ("である。", "ではない。"),
+    ("できる。", "できない。"),
+    ("される。", "されない。"),
+    ("行う。", "行わない。"),
+    ("する。", "しない。"),
+    ("ある。", "ない。"),
+)
+# 一括判定用（endswithはタプルを受け取れる）
+NEGATABLE_SUFFIXES = tuple(suffix for suffix, _ in SUFFIX_NEGATION_RULES)
+
+# キーワード置換ルール（キーワード, 置換後）、優先度順
+# 最初に含まれていたキーワードだけを置換する（空文字列は削除）
+KEYWORD_NEGATION_RULES = (
+    ("必ず", ""),  # "必ず"を削除して「行わなくてもよい」に変換
+    ("必須", "任意"),
+    ("必要", "不要"),
+)
@@ -3,7 +3,7 @@
 """
 import json
 import logging
-import uuid
+import secrets
 
 from app.schemas.quiz import QuizItem as QuizItemSchema
 from app.schemas.common import Citation
@@ -225,7 +225,7 @@ def _parse_single_quiz(
     """
     # IDを生成（LLMが返さない場合）
     if "id" not in quiz_data or not quiz_data["id"]:
-        quiz_data["id"] = str(uuid.uuid4())[:8]  # 短いID
+        quiz_data["id"] = secrets.token_hex(4)  # 短いID
     
     # statement フィールドの確認（question も互換性のため許容）
     if "statement" not in quiz_data:
@@ -80,12 +80,8 @@ def _deduplicate_citations(citations: list[Citation]) -> list[Citation]:
     deduplicated = []
     
     for citation in citations:
-        # source, page, quote先頭60文字で重複判定
-        key = (
-            citation.source,
-            citation.page,
-            citation.quote[:60] if citation.quote else ""
-        )
+        # source, page, quote先頭60文字で重複判定（キー定義はCitation.dedup_keyに一本化）
+        key = citation.dedup_key
         
         if key not in seen:
             seen.add(key)
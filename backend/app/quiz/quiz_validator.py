@@ -5,16 +5,25 @@
 """
 import logging
 import re
-import uuid
+import secrets
+from functools import lru_cache
 
 from app.schemas.quiz import QuizItem as QuizItemSchema
 from app.quiz.validator import validate_quiz_item
 from app.quiz.mutator import make_false_statement
+from app.quiz.mutation_rules import (
+    KEYWORD_NEGATION_RULES,
+    NEGATABLE_SUFFIXES,
+    SUFFIX_NEGATION_RULES,
+)
 from app.quiz.postprocess import postprocess_quiz_item
 
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# false_statement生成結果のキャッシュ件数（リトライで同じ○が繰り返し来るため）
+FALSE_STATEMENT_CACHE_SIZE = 1024
+
 # 否定語パターン（LLMが勝手に×を作るのを防ぐ）
 NEGATIVE_PATTERNS = [
     r'しない',
@@ -47,10 +56,14 @@ def contains_negative_phrase(statement: str) -> bool:
     return False
 
 
+@lru_cache(maxsize=FALSE_STATEMENT_CACHE_SIZE)
 def generate_false_statement_with_fallback(original_statement: str) -> tuple[str, str]:
     """
     false_statementを生成（Mutator優先、フォールバック付き）
     
+    original_statementのみで結果が決まる純粋関数なので@lru_cacheで結果を再利用する。
+    （キャッシュヒット時は内部の分岐ログは出ないため、結果は呼び出し側でログ出力する）
+    
     Args:
         original_statement: 元のstatement（○問題）
         
@@ -65,53 +78,30 @@ def generate_false_statement_with_fallback(original_statement: str) -> tuple[str
     
     # Mutatorが失敗した場合（元の文と同じ）、別の方法を試す
     if false_statement == original_statement:
-        logger.info("Mutator初回試行が失敗したため、代替方法を試行します")
+        logger.debug("Mutator初回試行が失敗したため、代替方法を試行します")
         
         # 代替方法1: 文末の否定化を試す（より積極的）
-        alternative_patterns = [
-            (r"行う。$", "行わない。"),
-            (r"確認する。$", "確認しない。"),
-            (r"連絡する。$", "連絡しない。"),
-            (r"報告する。$", "報告しない。"),
-            (r"実施する。$", "実施しない。"),
-            (r"実行する。$", "実行しない。"),
-            (r"処理する。$", "処理しない。"),
-            (r"対応する。$", "対応しない。"),
-            (r"である。$", "ではない。"),
-            (r"する。$", "しない。"),
-            (r"できる。$", "できない。"),
-            (r"される。$", "されない。"),
-            (r"ある。$", "ない。"),
-        ]
+        if original_statement.endswith(NEGATABLE_SUFFIXES):
+            for suffix, replacement in SUFFIX_NEGATION_RULES:
+                if original_statement.endswith(suffix):
+                    false_statement = original_statement[:-len(suffix)] + replacement
+                    logger.debug("代替方法で×問題を生成: 文末 '%s' を置換", suffix)
+                    source = "fallback"
+                    break
         
-        for pattern, replacement in alternative_patterns:
-            if re.search(pattern, original_statement):
-                false_statement = re.sub(pattern, replacement, original_statement)
+        # 代替方法2〜4: キーワード置換（ルール表を優先度順に1回だけ走査）
+        if false_statement == original_statement:
+            for keyword, replacement in KEYWORD_NEGATION_RULES:
+                if keyword not in original_statement:
+                    continue
+                false_statement = original_statement.replace(keyword, replacement)
+                if not replacement:
+                    # 削除した場合は残った空白を整える
+                    false_statement = false_statement.replace("  ", " ").strip()
                 if false_statement != original_statement:
-                    logger.info(f"代替方法で×問題を生成: パターン '{pattern}' を適用")
+                    logger.debug("代替方法で×問題を生成: '%s'を'%s'に変換", keyword, replacement)
                     source = "fallback"
                     break
-        
-        # 代替方法2: "必ず"を削除して「行わなくてもよい」に変換
-        if false_statement == original_statement and "必ず" in original_statement:
-            false_statement = original_statement.replace("必ず", "").replace("  ", " ").strip()
-            if false_statement != original_statement:
-                logger.info("代替方法で×問題を生成: '必ず'を削除")
-                source = "fallback"
-        
-        # 代替方法3: "必須"を"任意"に変換
-        if false_statement == original_statement and "必須" in original_statement:
-            false_statement = original_statement.replace("必須", "任意")
-            if false_statement != original_statement:
-                logger.info("代替方法で×問題を生成: '必須'を'任意'に変換")
-                source = "fallback"
-        
-        # 代替方法4: "必要"を"不要"に変換
-        if false_statement == original_statement and "必要" in original_statement:
-            false_statement = original_statement.replace("必要", "不要")
-            if false_statement != original_statement:
-                logger.info("代替方法で×問題を生成: '必要'を'不要'に変換")
-                source = "fallback"
     
     # すべての方法が失敗した場合
     if false_statement == original_statement:
@@ -160,7 +150,7 @@ def validate_and_process_quizzes(
             processed_quiz = quiz
         
         # dict に変換してバリデーション（○）
-        quiz_dict = processed_quiz.model_dump() if hasattr(processed_quiz, "model_dump") else processed_quiz.dict()
+        quiz_dict = processed_quiz.model_dump()
         statement = quiz_dict.get("statement", "")
         
         # 否定語チェック（LLMが勝手に×を作るのを防ぐ）
@@ -191,10 +181,10 @@ def validate_and_process_quizzes(
             if llm_false_statement and isinstance(llm_false_statement, str) and llm_false_statement.strip():
                 false_statement = llm_false_statement.strip()
                 false_source = "llm"
-                logger.info(f"LLM由来のfalse_statementを使用: {false_statement[:50]}...")
+                logger.info("LLM由来のfalse_statementを使用: %s...", false_statement[:50])
             else:
                 # false_statementがない or 空の場合、Mutatorで生成（保険）
-                logger.info(f"LLM由来のfalse_statementがないため、Mutatorで生成")
+                logger.info("LLM由来のfalse_statementがないため、Mutatorで生成")
                 
                 # [観測ログA] Mutator直前のstatement確認
                 request_id_str = str(request_id) if request_id is not None else "None"
@@ -208,22 +198,23 @@ def validate_and_process_quizzes(
                 
                 # Mutatorで生成（フォールバック付き）
                 false_statement, false_source = generate_false_statement_with_fallback(original_statement)
+                logger.info("false_statement生成結果: source=%s", false_source)
             
             # false_statementが取得できた場合のみ処理
             if false_statement and false_statement != original_statement:
-                # ×がvalidatorを通過するかチェック
-                false_quiz_dict = quiz_dict.copy()
-                false_quiz_dict["id"] = str(uuid.uuid4())[:8]  # 新しいIDを生成
-                false_quiz_dict["statement"] = false_statement
-                false_quiz_dict["answer_bool"] = False  # 必ず False
-                false_quiz_dict["false_statement"] = None  # ×問題にはfalse_statementは不要
+                # ×で差し替えるフィールド（id/statement/answer_bool以外は○と共通）
+                false_updates = {
+                    "id": secrets.token_hex(4),  # 新しいIDを生成
+                    "statement": false_statement,
+                    "answer_bool": False,  # 必ず False
+                }
                 
                 # validator チェック（×）
-                ok_false, reason_false = validate_quiz_item(false_quiz_dict)
+                ok_false, reason_false = validate_quiz_item({**quiz_dict, **false_updates})
                 
                 if ok_false:
-                    # ×として採用
-                    false_quiz = QuizItemSchema(**false_quiz_dict)
+                    # ×として採用（検証済みの○を複製して差し替え、dict→モデルの再構築と再検証を省く）
+                    false_quiz = processed_quiz.model_copy(update=false_updates)
                     accepted_false.append(false_quiz)
                     
                     # 統計更新
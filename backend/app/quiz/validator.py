@@ -7,6 +7,10 @@ import logging
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# 文字数の上限（JSON Schemaには入れず、ここで超過をrejectして理由別に集計する）
+STATEMENT_MAX_LEN = 120
+EXPLANATION_MAX_LEN = 150
+
 # 曖昧表現リスト（○×として判定不能な表現）
 AMBIGUOUS_PHRASES = [
     "場合がある",
@@ -107,7 +111,8 @@ def validate_quiz_item(item: dict) -> tuple[bool, str]:
     検証項目:
     - type が "true_false" であること
     - statement が断言文であること（疑問形禁止）
-    - statement が十分な長さであること（12文字以上）
+    - statement が十分な長さであること（12文字以上、STATEMENT_MAX_LEN文字以下）
+    - explanation が長すぎないこと（EXPLANATION_MAX_LEN文字以下）
     - statement に曖昧表現が含まれないこと
     - answer_bool が bool であること
     - citations が1件以上あること
@@ -134,6 +139,15 @@ def validate_quiz_item(item: dict) -> tuple[bool, str]:
     if len(statement.strip()) < 12:
         return (False, f"too_short:{len(statement.strip())}chars")
     
+    # statement の長さチェック（上限超過は途中で切らずにreject）
+    if len(statement.strip()) > STATEMENT_MAX_LEN:
+        return (False, f"too_long:{len(statement.strip())}chars")
+    
+    # explanation の長さチェック
+    explanation = item.get("explanation")
+    if isinstance(explanation, str) and len(explanation.strip()) > EXPLANATION_MAX_LEN:
+        return (False, f"explanation_too_long:{len(explanation.strip())}chars")
+    
     # 疑問形チェック（?, ？, でしょうか, ですか）
     if "?" in statement or "？" in statement:
         return (False, "contains_question_mark")
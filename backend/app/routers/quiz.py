@@ -3,8 +3,8 @@ Quiz APIルーター
 """
 import asyncio
 import logging
+import secrets
 import time
-import uuid
 from typing import Dict, Optional, List
 from fastapi import APIRouter, HTTPException, Query
 
@@ -91,8 +91,8 @@ async def generate_quizzes_endpoint(request: QuizGenerateRequest) -> QuizGenerat
     # タイミング計測開始
     t_start = time.perf_counter()
     
-    # request_id を生成（uuid短縮版、全attemptで共通）
-    request_id = str(uuid.uuid4())[:8]
+    # request_id を生成（8桁の16進数、全attemptで共通）
+    request_id = secrets.token_hex(4)
     
     logger.info(
         f"[QUIZ_GENERATE:START] request_id={request_id}, "
@@ -143,30 +143,29 @@ async def generate_quizzes_endpoint(request: QuizGenerateRequest) -> QuizGenerat
             f"accepted={len(accepted_quizzes)}, requested={request.count}, shortage={shortage}"
         )
         
-        # reject理由の内訳を集計
-        reject_reason_counts = {}
-        for item in rejected_items:
-            reason = item.get("reason", "unknown")
-            reject_reason_counts[reason] = reject_reason_counts.get(reason, 0) + 1
+        # reject理由の内訳（generate_quizzes_with_retryで全件分を集計済み）
+        reject_reason_counts = aggregated_stats.get("reject_reason_counts", {})
         
         # 最後に選べたcitation数を取得（aggregated_statsから取得）
         final_available_citations = aggregated_stats.get("final_available_citations", len(citations))
         
-        # debugレスポンスを構築（エラー情報を含む）
-        final_debug = build_debug_response(
-            request, quiz_debug_info, target_count,
-            len(citations), len(accepted_quizzes), rejected_items, error_info, attempts,
-            attempt_errors, aggregated_stats, t_retrieval_ms, t_llm_ms, 0
-        )
-        
-        # 不足情報を追加
-        final_debug["shortage"] = {
-            "requested": request.count,
-            "accepted": len(accepted_quizzes),
-            "shortage_count": shortage,
-            "reject_reason_counts": reject_reason_counts,
-            "final_available_citations": final_available_citations,
-        }
+        # debugレスポンスを構築（エラー情報を含む、debug=trueの場合のみ）
+        final_debug = None
+        if request.debug:
+            final_debug = build_debug_response(
+                request, quiz_debug_info, target_count,
+                len(citations), len(accepted_quizzes), rejected_items, error_info, attempts,
+                attempt_errors, aggregated_stats, t_retrieval_ms, t_llm_ms, 0
+            )
+            
+            # 不足情報を追加
+            final_debug["shortage"] = {
+                "requested": request.count,
+                "accepted": len(accepted_quizzes),
+                "shortage_count": shortage,
+                "reject_reason_counts": reject_reason_counts,
+                "final_available_citations": final_available_citations,
+            }
         
         # 422エラーを返す
         raise HTTPException(
@@ -183,12 +182,14 @@ async def generate_quizzes_endpoint(request: QuizGenerateRequest) -> QuizGenerat
     # 全体のタイミング計測
     t_total_ms = (time.perf_counter() - t_start) * 1000
     
-    # debugレスポンスを構築
-    final_debug = build_debug_response(
-        request, quiz_debug_info, target_count,
-        len(citations), len(accepted_quizzes), rejected_items, error_info, attempts,
-        attempt_errors, aggregated_stats, t_retrieval_ms, t_llm_ms, t_total_ms
-    )
+    # debugレスポンスを構築（debug=trueの場合のみ）
+    final_debug = None
+    if request.debug:
+        final_debug = build_debug_response(
+            request, quiz_debug_info, target_count,
+            len(citations), len(accepted_quizzes), rejected_items, error_info, attempts,
+            attempt_errors, aggregated_stats, t_retrieval_ms, t_llm_ms, t_total_ms
+        )
     
     # クイズセットを保存（save=true の場合）
     quiz_set_id = None
@@ -199,7 +200,7 @@ async def generate_quizzes_endpoint(request: QuizGenerateRequest) -> QuizGenerat
         try:
             # quizzes を dict に変換
             quizzes_dict = [
-                quiz.model_dump() if hasattr(quiz, "model_dump") else quiz.dict()
+                quiz.model_dump()
                 for quiz in accepted_quizzes
             ]
             
@@ -1,6 +1,8 @@
 """
 共通スキーマ定義
 """
+from functools import cached_property
+
 from pydantic import BaseModel
 
 
@@ -10,6 +12,15 @@ class Citation(BaseModel):
     page: int | None  # PDFならページ番号、txtならnull
     quote: str
 
+    @cached_property
+    def dedup_key(self) -> tuple:
+        """
+        重複チェック用のキー (source, page, quote_prefix)
+
+        初回アクセス時に1回だけ作成して保持する（生成後にフィールドを書き換えない前提）。
+        """
+        return (self.source, self.page, self.quote[:60] if self.quote else "")
+
 
 class ErrorResponse(BaseModel):
     """エラーレスポンス"""
@@ -80,6 +80,26 @@ class QuizItem(BaseModel):
         return self.statement
 
 
+class LLMQuizOutputItem(BaseModel):
+    """LLMが出力するクイズ1件（構造化出力のJSON Schema用、○のみ生成）"""
+    type: Literal["true_false"] = Field(..., description="問題タイプ（true_false固定）")
+    # 文字数の上限はスキーマに入れない（デコード時の制約になると文の途中で打ち切られるため、validatorで判定する）
+    statement: str = Field(..., description="引用に基づく断言文（肯定文のみ）")
+    answer_bool: Literal[True] = Field(..., description="正解（○のみ生成するため常にtrue）")
+    explanation: str = Field(..., description="理解を深める解説")
+    citations: list[Citation] = Field(..., description="入力で渡された引用")
+
+
+class LLMQuizOutput(BaseModel):
+    """
+    LLMのクイズ生成出力（構造化出力のJSON Schema用）
+
+    Ollamaの format にこのモデルのJSON Schemaを渡し、
+    JSON以外の出力やフィールド欠落をデコード時点で不可能にする。
+    """
+    quizzes: list[LLMQuizOutputItem] = Field(..., description="生成されたクイズのリスト")
+
+
 class QuizGenerateResponse(BaseModel):
     """クイズ生成レスポンス"""
     quizzes: list[QuizItem] = Field(..., description="生成されたクイズのリスト")
@@ -0,0 +1,125 @@
+"""
+重複チェック（StatementIndex）とMutatorのトリガー索引のテストスクリプト
+
+LLMやベクトルDBを使わずに実行できる。
+- 完全一致 / コア内容一致 / 近似重複（閾値指定時のみ）のヒットとミス
+- トリガー索引による候補ルール抽出が、全ルールの素朴な走査と一致すること
+"""
+import logging
+import sys
+from pathlib import Path
+
+# ロガー設定
+logging.basicConfig(
+    level=logging.WARNING,  # WARNING 以上のみ表示
+    format='%(levelname)s - %(message)s'
+)
+
+# app モジュールをインポート可能にする
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.quiz.duplication_checker import StatementIndex, is_duplicate_statement
+from app.quiz.mutation_rules import NEGATION_RULES
+from app.quiz.mutator import _candidate_rule_indexes, make_false_statement
+
+# 近似重複判定の閾値（テスト用）
+NEAR_DUPLICATE_THRESHOLD = 0.6
+
+ACCEPTED = "火災が発生した場合は、避難経路を確認してから避難する。"
+ACCEPTED_PROHIBITION = "営業中に店内で喫煙してはならない。"
+
+
+def check(label: str, actual, expected) -> bool:
+    """結果を表示し、期待値と一致したかを返す"""
+    ok = actual == expected
+    print(f"  {'✅' if ok else '❌'} {label}: actual={actual}, expected={expected}")
+    return ok
+
+
+def test_statement_index() -> bool:
+    """StatementIndexの完全一致 / コア内容一致 / 近似重複をテスト"""
+    print("\n=== StatementIndex Test ===\n")
+    results = []
+
+    # 近似重複判定なし（デフォルト）
+    print(f"Test 1: 近似重複判定なし（既存: {ACCEPTED} / {ACCEPTED_PROHIBITION}）")
+    index = StatementIndex()
+    index.add(ACCEPTED)
+    index.add(ACCEPTED_PROHIBITION)
+    cases = [
+        # 空白・句読点・全角半角の違いのみ → 完全一致
+        ("空白と句読点の違い", "火災が発生した場合は 避難経路を確認してから避難する", "exact"),
+        ("全角空白", "火災が発生した場合は、避難経路を確認してから　避難する。", "exact"),
+        # 否定語の言い換えだけが違う → コア内容一致（単純反転・言い換えを検出）
+        ("否定語の言い換え", "営業中に店内で喫煙しない。", "core"),
+        # 助詞だけが違う → 近似重複判定なしでは重複扱いしない
+        ("助詞の違い", "火災が発生した場合、避難経路を確認してから避難する。", None),
+        # 内容が違う → 重複なし
+        ("別の内容", "消火器の設置場所を毎月点検する。", None),
+    ]
+    for label, statement, expected in cases:
+        duplicate = index.find_duplicate(statement)
+        results.append(check(label, duplicate[0] if duplicate else None, expected))
+        results.append(check(f"{label}（is_duplicate_statement）", is_duplicate_statement(statement, index), expected is not None))
+    # 近似重複判定なしでは n-gram 集合を保持しない（Jaccard走査が走らない）
+    results.append(check("n-gram集合を保持しない", len(index._shingle_sets), 0))
+
+    # 近似重複判定あり
+    print(f"\nTest 2: 近似重複判定あり（threshold={NEAR_DUPLICATE_THRESHOLD}）")
+    index = StatementIndex(near_duplicate_threshold=NEAR_DUPLICATE_THRESHOLD)
+    index.add(ACCEPTED)
+    index.add(ACCEPTED_PROHIBITION)
+    cases = [
+        # ハッシュ検索で一致するものは従来どおりの種別
+        ("空白と句読点の違い", "火災が発生した場合は 避難経路を確認してから避難する", "exact"),
+        ("否定語の言い換え", "営業中に店内で喫煙しない。", "core"),
+        # 助詞だけが違う → 近似重複
+        ("助詞の違い", "火災が発生した場合、避難経路を確認してから避難する。", "near"),
+        # 内容が違う → 重複なし
+        ("別の内容", "消火器の設置場所を毎月点検する。", None),
+        ("一部だけ共通", "火災が発生した場合は、速やかに119番へ通報する。", None),
+    ]
+    for label, statement, expected in cases:
+        duplicate = index.find_duplicate(statement)
+        results.append(check(label, duplicate[0] if duplicate else None, expected))
+
+    return all(results)
+
+
+def test_trigger_index() -> bool:
+    """トリガー索引の候補ルール抽出が素朴な全ルール走査と一致することをテスト"""
+    print("\n=== Mutator Trigger Index Test ===\n")
+    results = []
+
+    statements = [
+        "店内での喫煙は禁止されている。",
+        "避難経路は必ず事前に確認する。",
+        "異常を発見したら直ちに責任者へ報告する。",
+        "開店前に最初にレジの釣り銭を確認する。",
+        "消火器は3本設置する。",
+        "従業員は名札を着用する。",
+    ]
+    for statement in statements:
+        # 素朴な走査: 文字列ルールは置換元が含まれるもの、正規表現ルールは常に候補
+        naive = [
+            index for index, (pattern, _) in enumerate(NEGATION_RULES)
+            if not isinstance(pattern, str) or pattern in statement
+        ]
+        results.append(check(f"候補ルール: {statement}", _candidate_rule_indexes(statement), naive))
+
+    print("\nTest: make_false_statement")
+    cases = [
+        ("店内での喫煙は禁止されている。", "店内での喫煙は許可されている。"),
+        ("従業員は名札を着用する。", "従業員は名札を着用しない。"),
+    ]
+    for statement, expected in cases:
+        results.append(check(statement, make_false_statement(statement), expected))
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    passed = test_statement_index()
+    passed = test_trigger_index() and passed
+    print(f"\n結果: {'全件成功' if passed else '失敗あり'}")
+    sys.exit(0 if passed else 1)